@@ -0,0 +1,148 @@
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Pool sizing configuration
+PRICE_POOL_WORKERS = 4   # yfinance / Yahoo Finance price lookups
+NEWS_POOL_WORKERS = 8    # Yahoo Finance / Google News scraping (two per symbol)
+CPU_POOL_WORKERS = min(4, os.cpu_count() or 1)  # TextBlob sentiment scoring
+
+POOL_SIZES = {
+    "price": PRICE_POOL_WORKERS,
+    "news": NEWS_POOL_WORKERS,
+    "cpu": CPU_POOL_WORKERS,
+}
+
+class ExecutorPool:
+    """A named, fixed-size thread pool that tracks queue length and utilization"""
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._peak_active = 0
+        self._completed = 0
+        self._failed = 0
+        self._cancelled = 0
+
+    def _ensure_executor(self) -> ThreadPoolExecutor:
+        # Caller must hold self._lock
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix=f"{self.name}-pool"
+            )
+            logger.info(f"Started {self.name} executor with {self.max_workers} workers")
+        return self._executor
+
+    def start(self) -> None:
+        """Create the worker pool, reopening it if it was shut down"""
+        with self._lock:
+            self._closed = False
+            self._ensure_executor()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the pool, cancelling queued tasks; later submits raise RuntimeError"""
+        with self._lock:
+            self._closed = True
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+            logger.info(f"Shut down {self.name} executor")
+
+    def _run(self, func: Callable, args: tuple, kwargs: Dict[str, Any], submitted: float) -> Any:
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+            self._peak_active = max(self._peak_active, self._active)
+        queue_wait_ms = round((time.perf_counter() - submitted) * 1000, 2)
+        try:
+            with span(f"{self.name}_pool", function=func.__name__, queue_wait_ms=queue_wait_ms):
+                result = func(*args, **kwargs)
+        except BaseException:
+            with self._lock:
+                self._active -= 1
+                self._failed += 1
+            raise
+        with self._lock:
+            self._active -= 1
+            self._completed += 1
+        return result
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        # Run in a copy of the caller's context so request traces follow the task
+        context = contextvars.copy_context()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"{self.name} executor has been shut down")
+            # Start lazily so the pools also work outside the FastAPI lifecycle
+            executor = self._ensure_executor()
+            future = executor.submit(context.run, self._run, func, args, kwargs, time.perf_counter())
+            self._queued += 1
+        # Tasks cancelled before they start never reach _run
+        future.add_done_callback(self._on_done)
+        return future
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run func on this pool and await its result from the event loop"""
+        return await asyncio.wrap_future(self.submit(func, *args, **kwargs))
+
+    def _on_done(self, future: Future) -> None:
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+                self._cancelled += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "running": self._executor is not None,
+                "max_workers": self.max_workers,
+                "active": self._active,
+                "queued": self._queued,
+                "peak_active": self._peak_active,
+                "completed": self._completed,  # finished without raising
+                "failed": self._failed,
+                "cancelled": self._cancelled,  # cancelled before starting
+                "utilization": round(self._active / self.max_workers, 3) if self.max_workers else 0.0
+            }
+
+class ExecutorRegistry:
+    """Application-wide set of named executor pools"""
+
+    def __init__(self, pool_sizes: Dict[str, int] = POOL_SIZES):
+        self._pools = {name: ExecutorPool(name, size) for name, size in pool_sizes.items()}
+
+    def get(self, name: str) -> ExecutorPool:
+        try:
+            return self._pools[name]
+        except KeyError:
+            raise KeyError(f"Unknown executor pool: {name}")
+
+    def start(self) -> None:
+        for pool in self._pools.values():
+            pool.start()
+
+    def shutdown(self, wait: bool = True) -> None:
+        for pool in self._pools.values():
+            pool.shutdown(wait=wait)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: pool.stats() for name, pool in self._pools.items()}
+
+# Global executor registry, started and shut down with the application
+executors = ExecutorRegistry()
@@ -1,10 +1,13 @@
-from fastapi import FastAPI, HTTPException, Request, Query
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, HTTPException, Request, Query, Depends
+from fastapi.responses import HTMLResponse, PlainTextResponse
 from fastapi.templating import Jinja2Templates
 from typing import List
 import logging
 import asyncio
 from scraper import get_stock_sentiment, StockSentimentError, stock_cache
+from executors import executors
+import tracing
+from tracing import tracer, profiler, MAX_PROFILE_DURATION
 
 app = FastAPI(title="Stock Sentiment Tracker", version="1.0.0")
 templates = Jinja2Templates(directory="templates")
@@ -12,6 +15,28 @@ templates = Jinja2Templates(directory="templates")
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def start_executors():
+    """Create the shared price, news and CPU worker pools"""
+    executors.start()
+
+@app.on_event("shutdown")
+async def shutdown_executors():
+    """Drain and stop the shared worker pools"""
+    # Running scrapes can take many seconds, so wait for them off the event loop
+    await asyncio.to_thread(executors.shutdown, True)
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """Record a span tree for each request while tracing is enabled"""
+    if request.url.path.startswith("/debug"):
+        return await call_next(request)
+    
+    with tracer.trace(f"{request.method} {request.url.path}", query=str(request.url.query)) as root_span:
+        response = await call_next(request)
+        root_span.set_attribute("status_code", response.status_code)
+        return response
+
 @app.get("/")
 async def root():
     return {"message": "Stock Sentiment Tracker API"}
@@ -146,6 +171,59 @@ async def cache_status():
         "cached_symbols": cache_files
     }
 
+@app.get("/executors/status")
+async def executors_status():
+    """Get queue length and utilization for each worker pool"""
+    return {
+        "pools": executors.stats()
+    }
+
+def require_debug_endpoints():
+    """Hide the /debug endpoints unless the operator enabled them in tracing.py"""
+    # Read through the module so the setting can be changed after import
+    if not tracing.DEBUG_ENDPOINTS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+@app.get("/debug/traces", dependencies=[Depends(require_debug_endpoints)])
+async def debug_traces():
+    """Get the most recent slow request traces, newest first"""
+    traces = tracer.traces()
+    return {
+        "tracing_enabled": tracer.enabled,
+        "slow_threshold_seconds": tracer.threshold,
+        "total_traces": len(traces),
+        "traces": traces
+    }
+
+@app.post("/debug/tracing", dependencies=[Depends(require_debug_endpoints)])
+async def toggle_tracing(enabled: bool = Query(..., description="Turn request tracing on or off")):
+    """Enable or disable per-request tracing"""
+    tracer.enabled = enabled
+    return {"tracing_enabled": tracer.enabled}
+
+@app.post("/debug/traces/clear", dependencies=[Depends(require_debug_endpoints)])
+async def clear_traces():
+    """Discard all recorded traces"""
+    tracer.clear()
+    return {"message": "Recorded traces cleared"}
+
+@app.post("/debug/profiler", dependencies=[Depends(require_debug_endpoints)])
+async def toggle_profiler(enabled: bool = Query(..., description="Turn the sampling profiler on or off")):
+    """Enable or disable the sampling profiler endpoint"""
+    profiler.enabled = enabled
+    return {"profiler_enabled": profiler.enabled}
+
+@app.get("/debug/profile", response_class=PlainTextResponse, dependencies=[Depends(require_debug_endpoints)])
+async def debug_profile(seconds: float = Query(5.0, gt=0, le=MAX_PROFILE_DURATION, description="Sampling window in seconds")):
+    """Sample all threads for a time window and return collapsed stacks for flamegraph tools"""
+    if not profiler.enabled:
+        raise HTTPException(status_code=403, detail="Sampling profiler is disabled, enable it with POST /debug/profiler?enabled=true")
+    
+    try:
+        return await asyncio.to_thread(profiler.profile, seconds)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
 @app.get("/chart/html", response_class=HTMLResponse)
 async def chart_view(request: Request, symbols: List[str] = Query(..., description="List of stock symbols for chart")):
     """Chart view showing price vs sentiment correlation"""
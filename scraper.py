@@ -5,13 +5,14 @@ from textblob import TextBlob
 import logging
 from typing import Dict, List, Any, Optional
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 import time
 import random
 from functools import wraps
 import json
 import os
 from datetime import datetime, timedelta
+from executors import executors
+from tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -114,7 +115,8 @@ def rate_limit(func):
         if time_since_last < MIN_REQUEST_INTERVAL:
             sleep_time = MIN_REQUEST_INTERVAL - time_since_last + random.uniform(0.1, 0.5)
             logger.info(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
-            time.sleep(sleep_time)
+            with span("rate_limit.sleep", function=func.__name__, seconds=round(sleep_time, 3)):
+                time.sleep(sleep_time)
         
         LAST_REQUEST_TIME = time.time()
         return func(*args, **kwargs)
@@ -129,7 +131,8 @@ def retry_with_backoff(max_retries=3, base_delay=1.0, max_delay=60.0):
             
             for attempt in range(max_retries + 1):
                 try:
-                    return func(*args, **kwargs)
+                    with span(func.__name__, attempt=attempt + 1):
+                        return func(*args, **kwargs)
                 except Exception as e:
                     last_exception = e
                     
@@ -147,7 +150,8 @@ def retry_with_backoff(max_retries=3, base_delay=1.0, max_delay=60.0):
                     total_delay = delay + jitter
                     
                     logger.warning(f"Attempt {attempt + 1} failed for {func.__name__}: {str(e)}. Retrying in {total_delay:.2f}s")
-                    time.sleep(total_delay)
+                    with span("retry.sleep", function=func.__name__, attempt=attempt + 1, seconds=round(total_delay, 3)):
+                        time.sleep(total_delay)
             
             raise last_exception
         return wrapper
@@ -159,7 +163,8 @@ def get_stock_price_yfinance(symbol: str) -> Dict[str, Any]:
     """Get stock price using yfinance with rate limiting and retry logic"""
     ticker = yf.Ticker(symbol)
     
-    hist = ticker.history(period="1d")
+    with span("yfinance.history", symbol=symbol):
+        hist = ticker.history(period="1d")
     if hist.empty:
         raise StockSentimentError(f"No price data found for symbol {symbol}, symbol may be delisted or blocked")
     
@@ -176,7 +181,8 @@ def get_stock_price_yfinance(symbol: str) -> Dict[str, Any]:
     # Get company name from fast_info or fallback to info
     company_name = symbol
     try:
-        info = ticker.info
+        with span("yfinance.info", symbol=symbol):
+            info = ticker.info
         company_name = info.get('longName', symbol)
     except:
         pass
@@ -204,10 +210,12 @@ def get_stock_price_yahoo_finance(symbol: str) -> Dict[str, Any]:
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
     }
     
-    response = requests.get(url, headers=headers, timeout=10)
+    with span("http.get", url=url):
+        response = requests.get(url, headers=headers, timeout=10)
     response.raise_for_status()
     
-    soup = BeautifulSoup(response.content, 'html.parser')
+    with span("html.parse", bytes=len(response.content)):
+        soup = BeautifulSoup(response.content, 'html.parser')
     
     # Try multiple methods to find price elements
     price_elem = soup.find('fin-streamer', {'data-symbol': symbol, 'data-field': 'regularMarketPrice'})
@@ -300,10 +308,12 @@ def scrape_yahoo_finance_news(symbol: str) -> List[str]:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         
-        response = requests.get(url, headers=headers, timeout=10)
+        with span("http.get", url=url):
+            response = requests.get(url, headers=headers, timeout=10)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        with span("html.parse", bytes=len(response.content)):
+            soup = BeautifulSoup(response.content, 'html.parser')
         headlines = []
         
         news_items = soup.find_all(['h3', 'h4'], class_=lambda x: x and 'headline' in x.lower())
@@ -339,10 +349,12 @@ def scrape_google_news(symbol: str) -> List[str]:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         
-        response = requests.get(url, headers=headers, timeout=10)
+        with span("http.get", url=url):
+            response = requests.get(url, headers=headers, timeout=10)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        with span("html.parse", bytes=len(response.content)):
+            soup = BeautifulSoup(response.content, 'html.parser')
         headlines = []
         
         articles = soup.find_all('article')
@@ -362,14 +374,14 @@ def scrape_google_news(symbol: str) -> List[str]:
         logger.error(f"Error scraping Google news for {symbol}: {str(e)}")
         return []
 
-def get_news_headlines(symbol: str) -> List[str]:
+async def get_news_headlines(symbol: str) -> List[str]:
+    """Fetch both news sources on the news pool without tying up a worker to wait on them"""
     try:
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            yahoo_future = executor.submit(scrape_yahoo_finance_news, symbol)
-            google_future = executor.submit(scrape_google_news, symbol)
-            
-            yahoo_headlines = yahoo_future.result()
-            google_headlines = google_future.result()
+        news_pool = executors.get("news")
+        yahoo_headlines, google_headlines = await asyncio.gather(
+            news_pool.run(scrape_yahoo_finance_news, symbol),
+            news_pool.run(scrape_google_news, symbol)
+        )
         
         all_headlines = yahoo_headlines + google_headlines
         unique_headlines = list(dict.fromkeys(all_headlines))
@@ -435,22 +447,25 @@ def analyze_sentiment(headlines: List[str]) -> Dict[str, Any]:
     }
 
 async def get_stock_sentiment(symbol: str) -> Dict[str, Any]:
+    with span("stock_sentiment", symbol=symbol):
+        return await _get_stock_sentiment(symbol)
+
+async def _get_stock_sentiment(symbol: str) -> Dict[str, Any]:
     # Check cache first
-    cached_data = stock_cache.get(symbol)
+    with span("cache.get", symbol=symbol) as cache_span:
+        cached_data = stock_cache.get(symbol)
+        cache_span.set_attribute("hit", bool(cached_data))
     if cached_data:
         return cached_data
     
     try:
-        loop = asyncio.get_event_loop()
-        
-        with ThreadPoolExecutor() as executor:
-            price_future = loop.run_in_executor(executor, get_stock_price, symbol)
-            news_future = loop.run_in_executor(executor, get_news_headlines, symbol)
-            
-            price_data = await price_future
-            headlines = await news_future
+        price_data, headlines = await asyncio.gather(
+            executors.get("price").run(get_stock_price, symbol),
+            get_news_headlines(symbol)
+        )
         
-        sentiment_data = analyze_sentiment(headlines)
+        with span("sentiment.score", headlines=len(headlines)):
+            sentiment_data = await executors.get("cpu").run(analyze_sentiment, headlines)
         
         result = {
             "symbol": symbol,
@@ -461,7 +476,8 @@ async def get_stock_sentiment(symbol: str) -> Dict[str, Any]:
         }
         
         # Cache the result
-        stock_cache.set(symbol, result)
+        with span("cache.set", symbol=symbol):
+            stock_cache.set(symbol, result)
         
         return result
         
@@ -0,0 +1,64 @@
+import threading
+
+import pytest
+
+from executors import ExecutorPool
+
+def test_queue_accounting_with_cancellation():
+    pool = ExecutorPool("test", 1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocker():
+        started.set()
+        release.wait(5)
+        return "done"
+
+    def fail():
+        raise ValueError("boom")
+
+    try:
+        running = pool.submit(blocker)
+        assert started.wait(5)
+        waiting = pool.submit(lambda: "waiting")
+        failing = pool.submit(fail)
+        cancelled = pool.submit(lambda: "never runs")
+
+        stats = pool.stats()
+        assert stats["active"] == 1
+        assert stats["queued"] == 3
+        assert stats["utilization"] == 1.0
+
+        assert cancelled.cancel()
+        stats = pool.stats()
+        assert stats["queued"] == 2
+        assert stats["cancelled"] == 1
+
+        release.set()
+        assert running.result(5) == "done"
+        assert waiting.result(5) == "waiting"
+        with pytest.raises(ValueError):
+            failing.result(5)
+
+        stats = pool.stats()
+        assert stats["active"] == 0
+        assert stats["queued"] == 0
+        assert stats["completed"] == 2
+        assert stats["failed"] == 1
+        assert stats["cancelled"] == 1
+    finally:
+        release.set()
+        pool.shutdown()
+
+def test_submit_after_shutdown_raises():
+    pool = ExecutorPool("test", 1)
+    assert pool.submit(lambda: 1).result(5) == 1
+    pool.shutdown()
+
+    with pytest.raises(RuntimeError):
+        pool.submit(lambda: 2)
+    assert pool.stats()["running"] is False
+
+    pool.start()
+    assert pool.submit(lambda: 3).result(5) == 3
+    pool.shutdown()
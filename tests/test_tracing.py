@@ -0,0 +1,132 @@
+import re
+import threading
+import time
+
+import pytest
+
+from executors import ExecutorPool
+from tracing import SamplingProfiler, Tracer, span
+
+def _children(node, name):
+    return [child for child in node["children"] if child["name"] == name]
+
+def test_spans_nest_across_pool_threads():
+    tracer = Tracer(enabled=True, threshold=0.0)
+    pool = ExecutorPool("test", 1)
+
+    def work():
+        with span("inner", step=1):
+            return threading.current_thread().name
+
+    try:
+        with tracer.trace("GET /stock/AAPL"):
+            with span("outer"):
+                worker_thread = pool.submit(work).result(5)
+    finally:
+        pool.shutdown()
+
+    root = tracer.traces()[0]["root"]
+    [outer] = _children(root, "outer")
+    [pool_span] = _children(outer, "test_pool")
+    [inner] = _children(pool_span, "inner")
+    assert pool_span["attributes"]["function"] == "work"
+    assert "queue_wait_ms" in pool_span["attributes"]
+    assert inner["thread"] == worker_thread
+    assert inner["attributes"] == {"step": 1}
+
+def test_span_is_noop_without_active_trace():
+    with span("orphan") as orphan:
+        orphan.set_attribute("ignored", True)
+
+    tracer = Tracer(enabled=False, threshold=0.0)
+    with tracer.trace("GET /"):
+        with span("child"):
+            pass
+    assert tracer.traces() == []
+
+def test_fast_trace_is_not_recorded():
+    tracer = Tracer(enabled=True, threshold=10.0)
+    with tracer.trace("GET /stock/AAPL"):
+        with span("cache.get"):
+            pass
+    assert tracer.traces() == []
+
+def test_buffer_evicts_oldest_and_returns_newest_first():
+    tracer = Tracer(enabled=True, threshold=0.0, buffer_size=2)
+    for name in ["first", "second", "third"]:
+        with tracer.trace(name):
+            pass
+    assert [trace["name"] for trace in tracer.traces()] == ["third", "second"]
+
+    tracer.clear()
+    assert tracer.traces() == []
+
+def test_recorded_trace_is_a_snapshot():
+    tracer = Tracer(enabled=True, threshold=0.0)
+    with tracer.trace("GET /compare"):
+        with span("price_pool") as late:
+            pass
+    late.set_attribute("written_after_record", True)
+
+    [trace] = tracer.traces()
+    assert trace["root"]["children"][0]["attributes"] == {}
+
+def test_retry_and_rate_limit_spans(monkeypatch):
+    scraper = pytest.importorskip("scraper")
+    monkeypatch.setattr(scraper.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(scraper, "LAST_REQUEST_TIME", time.time())
+    calls = []
+
+    @scraper.rate_limit
+    @scraper.retry_with_backoff(max_retries=2, base_delay=0.01)
+    def flaky_fetch():
+        calls.append(1)
+        if len(calls) < 3:
+            raise ConnectionError("temporary failure")
+        return "ok"
+
+    tracer = Tracer(enabled=True, threshold=0.0)
+    with tracer.trace("GET /stock/AAPL"):
+        assert flaky_fetch() == "ok"
+
+    root = tracer.traces()[0]["root"]
+    [rate_limit_sleep] = _children(root, "rate_limit.sleep")
+    assert rate_limit_sleep["attributes"]["function"] == "flaky_fetch"
+
+    attempts = _children(root, "flaky_fetch")
+    assert [a["attributes"]["attempt"] for a in attempts] == [1, 2, 3]
+    assert "error" in attempts[0]["attributes"]
+    assert "error" not in attempts[2]["attributes"]
+
+    retry_sleeps = _children(root, "retry.sleep")
+    assert [s["attributes"]["attempt"] for s in retry_sleeps] == [1, 2]
+
+def test_profiler_returns_collapsed_stacks():
+    profiler = SamplingProfiler(enabled=True, interval=0.001)
+    stop = threading.Event()
+    busy = threading.Thread(target=stop.wait, args=(5,), name="busy-thread")
+    busy.start()
+    try:
+        output = profiler.profile(0.05)
+    finally:
+        stop.set()
+        busy.join()
+
+    lines = output.splitlines()
+    assert lines
+    assert all(re.fullmatch(r"\S.* \d+", line) for line in lines)
+    assert any(line.startswith("busy-thread;") for line in lines)
+
+def test_profiler_rejects_concurrent_profiles():
+    profiler = SamplingProfiler(enabled=True, interval=0.001)
+    background = threading.Thread(target=profiler.profile, args=(0.5,))
+    background.start()
+    try:
+        deadline = time.time() + 5
+        while not profiler._lock.locked() and time.time() < deadline:
+            time.sleep(0.001)
+
+        with pytest.raises(RuntimeError):
+            profiler.profile(0.01)
+    finally:
+        background.join()
@@ -0,0 +1,199 @@
+import contextvars
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Debug endpoint configuration
+DEBUG_ENDPOINTS_ENABLED = False  # Must be True for any /debug endpoint to respond
+
+# Tracing configuration
+TRACING_ENABLED = False       # Opt-in, toggle at runtime via POST /debug/tracing
+SLOW_TRACE_THRESHOLD = 1.0    # Keep traces of requests slower than 1 second
+TRACE_BUFFER_SIZE = 50        # Number of slow traces kept in memory
+
+# Profiler configuration
+PROFILER_ENABLED = False      # Opt-in, toggle at runtime via POST /debug/profiler
+PROFILE_INTERVAL = 0.005      # Sample every 5 milliseconds
+MAX_PROFILE_DURATION = 60.0   # Longest allowed sampling window in seconds
+
+class Span:
+    """A timed step within a request trace"""
+
+    def __init__(self, name: str, attributes: Dict[str, Any]):
+        self.name = name
+        self.attributes = attributes
+        self.thread = threading.current_thread().name
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.children: List["Span"] = []
+        self._lock = threading.Lock()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        # Pool tasks can outlive the request and write while the trace is serialized
+        with self._lock:
+            self.attributes[key] = value
+
+    def add_child(self, child: "Span") -> None:
+        # Children may be added concurrently from several pool threads
+        with self._lock:
+            self.children.append(child)
+
+    def finish(self) -> None:
+        self.end = time.perf_counter()
+
+    @property
+    def duration(self) -> float:
+        return (self.end or time.perf_counter()) - self.start
+
+    def to_dict(self, origin: float) -> Dict[str, Any]:
+        with self._lock:
+            attributes = dict(self.attributes)
+            children = sorted(self.children, key=lambda child: child.start)
+        return {
+            "name": self.name,
+            "start_ms": round((self.start - origin) * 1000, 2),
+            "duration_ms": round(self.duration * 1000, 2),
+            "thread": self.thread,
+            "attributes": attributes,
+            "children": [child.to_dict(origin) for child in children]
+        }
+
+class _NullSpan:
+    """Stand-in yielded by span() when no trace is being recorded"""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Any]:
+    """Record a child span of the current span, or do nothing if no trace is active"""
+    parent = _current_span.get()
+    if parent is None:
+        yield _NULL_SPAN
+        return
+
+    child = Span(name, attributes)
+    parent.add_child(child)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.set_attribute("error", str(e) or type(e).__name__)
+        raise
+    finally:
+        child.finish()
+        _current_span.reset(token)
+
+class Tracer:
+    """Records a span tree per request and keeps the most recent slow traces"""
+
+    def __init__(self, enabled: bool = TRACING_ENABLED, threshold: float = SLOW_TRACE_THRESHOLD,
+                 buffer_size: int = TRACE_BUFFER_SIZE):
+        self.enabled = enabled
+        self.threshold = threshold
+        self._traces: deque = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def trace(self, name: str, **attributes) -> Iterator[Any]:
+        """Start a new trace rooted at name if tracing is enabled"""
+        if not self.enabled:
+            yield _NULL_SPAN
+            return
+
+        root = Span(name, attributes)
+        started_at = datetime.now()
+        token = _current_span.set(root)
+        try:
+            yield root
+        except BaseException as e:
+            root.set_attribute("error", str(e) or type(e).__name__)
+            raise
+        finally:
+            root.finish()
+            _current_span.reset(token)
+            if root.duration >= self.threshold:
+                self._record(root, started_at)
+
+    def _record(self, root: Span, started_at: datetime) -> None:
+        trace = {
+            "trace_id": uuid.uuid4().hex,
+            "name": root.name,
+            "started_at": started_at.isoformat(),
+            "duration_ms": round(root.duration * 1000, 2),
+            "root": root.to_dict(root.start)
+        }
+        with self._lock:
+            self._traces.append(trace)
+        logger.info(f"Recorded slow trace for {root.name} ({trace['duration_ms']}ms)")
+
+    def traces(self) -> List[Dict[str, Any]]:
+        """Slow traces currently in the buffer, newest first"""
+        with self._lock:
+            return list(reversed(self._traces))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._traces.clear()
+
+class SamplingProfiler:
+    """Samples every thread's stack and reports them in collapsed (flamegraph) format"""
+
+    def __init__(self, enabled: bool = PROFILER_ENABLED, interval: float = PROFILE_INTERVAL):
+        self.enabled = enabled
+        self.interval = interval
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _frame_label(frame) -> str:
+        code = frame.f_code
+        filename = os.path.basename(code.co_filename)
+        return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+    def profile(self, duration: float) -> str:
+        """Sample all threads for duration seconds, blocking the calling thread
+
+        Returns one line per unique stack, "thread;outer;...;inner count",
+        which flamegraph.pl and speedscope read directly.
+        """
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("A profile is already being collected")
+
+        try:
+            own_thread = threading.get_ident()
+            stacks: Counter = Counter()
+            deadline = time.perf_counter() + duration
+
+            while time.perf_counter() < deadline:
+                thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == own_thread:
+                        continue
+                    labels = []
+                    while frame is not None:
+                        labels.append(self._frame_label(frame))
+                        frame = frame.f_back
+                    labels.append(thread_names.get(thread_id, str(thread_id)))
+                    stacks[";".join(reversed(labels))] += 1
+                time.sleep(self.interval)
+
+            return "\n".join(f"{stack} {count}" for stack, count in stacks.most_common())
+        finally:
+            self._lock.release()
+
+# Global tracer and profiler instances
+tracer = Tracer()
+profiler = SamplingProfiler()